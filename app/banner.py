@@ -6,8 +6,11 @@ configuration, and API endpoints.
 """
 
 import os
+import sys
 from app.version import __version__
 
+MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
+
 
 def display_startup_banner(port: int, workers: int):
     """
@@ -18,7 +21,6 @@ def display_startup_banner(port: int, workers: int):
         workers: Number of worker processes.
     """
     host = "localhost"
-    max_mb = int(os.getenv("MAX_FILE_SIZE_MB", "50"))
 
     sep = "─" * 58
 
@@ -37,7 +39,7 @@ def display_startup_banner(port: int, workers: int):
         "",
         f"  ▸ Version      {__version__}",
         f"  ▸ Workers      {workers}",
-        f"  ▸ Max Upload   {max_mb} MB",
+        f"  ▸ Max Upload   {MAX_FILE_SIZE_MB} MB",
         "",
         f"  {sep}",
         "",
@@ -58,6 +60,4 @@ def display_startup_banner(port: int, workers: int):
         "",
     ]
 
-    print(art)
-    for line in info_lines:
-        print(line)
+    sys.stdout.write(art + "\n" + "\n".join(info_lines) + "\n")
@@ -0,0 +1,50 @@
+"""
+In-memory cache of serialized extraction responses.
+
+Responses are keyed on a digest of the uploaded PDF plus the extraction
+options, so re-uploading the same file (retries, or several endpoints hit
+with the same document) skips parsing and extraction entirely.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of response bodies bounded by total size.
+
+    Not thread-safe; it is only used from the event loop.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Total size budget for cached bodies. 0 disables the cache.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached body for ``key``, or None on a miss."""
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: Hashable, body: bytes):
+        """Store ``body`` under ``key``, evicting the oldest entries to fit."""
+        if len(body) > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+
+        self._entries[key] = body
+        self._size += len(body)
+
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
@@ -8,9 +8,16 @@ This module provides the core extraction functionality:
 - Scanned/image-based page detection
 """
 
+import functools
+import importlib.util
 import io
 import logging
-from typing import Optional
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, repeat
+from typing import Callable, Optional
 
 import pymupdf
 
@@ -19,66 +26,129 @@ from app.models import PageResult, ExtractionResponse, TextExtractionResponse, T
 logger = logging.getLogger(__name__)
 
 
-def parse_page_range(page_range: Optional[str], total_pages: int) -> list[int]:
+class PageWorkerCrashed(RuntimeError):
     """
-    Parse a page range string into a list of page indices.
+    A page-pool worker died while extracting a document.
     
-    Supports formats like:
-    - "0-5" -> [0, 1, 2, 3, 4, 5]
-    - "0,2,4" -> [0, 2, 4]
-    - "0-2,5,7-9" -> [0, 1, 2, 5, 7, 8, 9]
-    - None -> all pages
+    Raised instead of BrokenProcessPool so callers running extraction in
+    their own pool can tell this apart from their pool breaking.
     """
-    if page_range is None:
-        return list(range(total_pages))
+
+# Number of worker processes used to find tables on one PDF's pages in parallel.
+# Defaults to 1 (no page pool): the server already runs requests in parallel,
+# see _extraction_pool in app.main, which is sized down as this goes up.
+PAGE_WORKERS = max(1, int(os.getenv("PAGE_WORKERS", "1")))
+
+# Below this many pages, process start-up costs more than it saves
+_MIN_PARALLEL_PAGES = 4
+
+# Text extraction flags for layout mode
+_TEXT_FLAGS = pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_DEHYPHENATE
+
+# With pymupdf_layout installed, find_tables() also detects tables from
+# layout boxes, so pages without vector graphics may still contain tables
+_HAS_LAYOUT_ANALYZER = importlib.util.find_spec("pymupdf.layout") is not None
+
+# Whitespace that would break a markdown table row, mapped to spaces
+_CELL_TRANS = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+# Markdown separator rows keyed by column count, see _sep()
+_sep_cache: dict[int, str] = {}
+
+# Document opened once per worker process by _init_worker
+_worker_doc: Optional[pymupdf.Document] = None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_range_spec(page_range: str) -> tuple[tuple[int, int], ...]:
+    """
+    Parse a page range string into sorted, non-overlapping (start, end) intervals.
     
-    pages = set()
+    Bounds are inclusive and not yet clamped to the document length, so the
+    result only depends on the string and can be cached across requests.
+    """
+    intervals = []
     for part in page_range.split(","):
-        part = part.strip()
         if "-" in part:
             start, end = part.split("-", 1)
-            start = max(0, int(start.strip()))
-            end = min(total_pages - 1, int(end.strip()))
-            pages.update(range(start, end + 1))
+            start, end = max(0, int(start)), int(end)
         else:
-            page_num = int(part.strip())
-            if 0 <= page_num < total_pages:
-                pages.add(page_num)
+            start = end = int(part)
+        if start <= end:
+            intervals.append((start, end))
+    
+    intervals.sort()
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    
+    return tuple(merged)
+
+
+def parse_page_range(page_range: Optional[str], total_pages: int) -> Sequence[int]:
+    """
+    Parse a page range string into a sequence of page indices.
     
-    return sorted(pages)
+    Supports formats like:
+    - "0-5" -> [0, 1, 2, 3, 4, 5]
+    - "0,2,4" -> [0, 2, 4]
+    - "0-2,5,7-9" -> [0, 1, 2, 5, 7, 8, 9]
+    - None -> all pages, as a range so nothing is materialized
+    """
+    if page_range is None:
+        return range(total_pages)
+    
+    last = total_pages - 1
+    return list(chain.from_iterable(
+        range(start, min(end, last) + 1)
+        for start, end in _parse_range_spec(page_range)
+    ))
 
 
-def _detect_scanned_page(page: pymupdf.Page, text: str) -> bool:
+def _detect_scanned_page(images: list, text: str) -> bool:
     """
     Detect if a page is scanned/image-based.
     
     A page is considered scanned if it has images but very little
-    or no extractable text.
+    or no extractable text. Takes the page's ``get_images()`` list so
+    callers that also need image metadata only walk the page once.
     """
-    images = page.get_images(full=False)
-    text_stripped = text.strip()
-    
-    # Page has images but minimal text (< 20 chars could be artifacts)
-    if len(images) > 0 and len(text_stripped) < 20:
+    # Page has images but minimal text (< 20 chars could be artifacts).
+    # Check images first so text-only pages never copy their text to strip it.
+    if len(images) > 0 and len(text.strip()) < 20:
         return True
     
     return False
 
 
-def _extract_page_text(page: pymupdf.Page, layout_mode: bool) -> str:
-    """Extract text from a single page."""
-    if layout_mode:
-        # "text" with sort=True preserves reading order
-        # Using flags for better extraction
-        text = page.get_text(
-            "text",
-            sort=True,
-            flags=pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_DEHYPHENATE
-        )
-    else:
-        text = page.get_text("text")
+def _extract_page_text(page: pymupdf.Page, layout_mode: bool) -> tuple[str, int]:
+    """
+    Extract text from a single page.
     
-    return text
+    When the text flags match the blocks flags (outside layout mode), text
+    and block count are both read from one TextPage, so the page layout is
+    only analysed once.
+    
+    Returns:
+        Tuple of (text, text_block_count)
+    """
+    # Using flags for better extraction in layout mode
+    flags = _TEXT_FLAGS if layout_mode else pymupdf.TEXTFLAGS_TEXT
+    textpage = page.get_textpage(flags=flags)
+    # "text" with sort=True preserves reading order
+    text = page.get_text("text", sort=layout_mode, textpage=textpage)
+    
+    # Count text blocks with the default blocks flags (which e.g. drop text
+    # outside the mediabox), reusing the TextPage only if its flags match
+    if flags != pymupdf.TEXTFLAGS_BLOCKS:
+        textpage = None
+    blocks = page.get_text("blocks", textpage=textpage)
+    text_block_count = sum(1 for b in blocks if b[6] == 0)  # type 0 = text
+    
+    return text, text_block_count
 
 
 def _extract_page_tables(page: pymupdf.Page) -> tuple[list[dict], list[str]]:
@@ -92,6 +162,11 @@ def _extract_page_tables(page: pymupdf.Page) -> tuple[list[dict], list[str]]:
     tables_markdown = []
     
     try:
+        # Without the layout analyzer, find_tables() only builds tables from
+        # vector graphics, so a page without any drawings cannot yield one
+        if not _HAS_LAYOUT_ANALYZER and not page.get_cdrawings():
+            return tables_data, tables_markdown
+        
         tables = page.find_tables()
         
         for i, table in enumerate(tables):
@@ -120,6 +195,14 @@ def _extract_page_tables(page: pymupdf.Page) -> tuple[list[dict], list[str]]:
     return tables_data, tables_markdown
 
 
+def _sep(num_cols: int) -> str:
+    """Return the markdown header separator row for a table width."""
+    sep = _sep_cache.get(num_cols)
+    if sep is None:
+        sep = _sep_cache[num_cols] = "| " + " | ".join(["---"] * num_cols) + " |"
+    return sep
+
+
 def _table_to_markdown(data: list[list]) -> str:
     """Convert a table (list of lists) to markdown format."""
     if not data or len(data) == 0:
@@ -130,9 +213,8 @@ def _table_to_markdown(data: list[list]) -> str:
     for row in data:
         cleaned = []
         for cell in row:
-            val = str(cell) if cell is not None else ""
-            # Replace newlines within cells
-            val = val.replace("\n", " ").strip()
+            # Replace line breaks and tabs within cells
+            val = "" if cell is None else str(cell).translate(_CELL_TRANS).strip()
             cleaned.append(val)
         rows.append(cleaned)
     
@@ -144,28 +226,27 @@ def _table_to_markdown(data: list[list]) -> str:
     
     # Pad rows to have equal columns
     for row in rows:
-        while len(row) < num_cols:
-            row.append("")
+        row.extend(("",) * (num_cols - len(row)))
     
     # Build markdown table
     lines = []
     
     # Header row
-    lines.append("| " + " | ".join(rows[0]) + " |")
+    lines.append("| %s |" % " | ".join(rows[0]))
     # Separator
-    lines.append("| " + " | ".join(["---"] * num_cols) + " |")
+    lines.append(_sep(num_cols))
     # Data rows
     for row in rows[1:]:
-        lines.append("| " + " | ".join(row) + " |")
+        lines.append("| %s |" % " | ".join(row))
     
     return "\n".join(lines)
 
 
-def _extract_page_images(page: pymupdf.Page) -> list[dict]:
-    """Extract image metadata from a page."""
+def _extract_page_images(imgs: list) -> list[dict]:
+    """Extract image metadata from a page's ``get_images(full=True)`` list."""
     images = []
     
-    for img_index, img in enumerate(page.get_images(full=True)):
+    for img_index, img in enumerate(imgs):
         xref = img[0]
         width = img[2]
         height = img[3]
@@ -182,6 +263,115 @@ def _extract_page_images(page: pymupdf.Page) -> list[dict]:
     return images
 
 
+def _process_page(page: pymupdf.Page, layout_mode: bool) -> tuple[str, int, bool, list]:
+    """
+    Gather everything the text paths need from a page.
+    
+    Makes one image-list lookup, and a single layout pass when the text and
+    blocks flags agree (outside layout mode).
+    
+    Returns:
+        Tuple of (text, text_block_count, is_scanned, images)
+    """
+    text, text_block_count = _extract_page_text(page, layout_mode)
+    imgs = page.get_images(full=True)
+    return text, text_block_count, _detect_scanned_page(imgs, text), imgs
+
+
+def _process_full_page(
+    page: pymupdf.Page,
+    page_num: int,
+    extract_tables: bool,
+    extract_images: bool,
+    layout_mode: bool,
+) -> dict:
+    """Run every per-page extractor and return a picklable dict of the results."""
+    # Extract text, block count, scanned flag and image list
+    text, text_block_count, is_scanned, imgs = _process_page(page, layout_mode)
+    
+    # Extract tables
+    tables_data = []
+    tables_md = []
+    if extract_tables:
+        tables_data, tables_md = _extract_page_tables(page)
+    
+    # Extract images
+    image_meta = []
+    if extract_images:
+        image_meta = _extract_page_images(imgs)
+    
+    return {
+        "page_number": page_num,
+        "text": text,
+        "tables": tables_data,
+        "tables_markdown": tables_md,
+        "images": image_meta,
+        "is_scanned": is_scanned,
+        "text_block_count": text_block_count,
+    }
+
+
+def _process_text_page(page: pymupdf.Page, page_num: int, layout_mode: bool) -> tuple[str, bool]:
+    """Extract text and scanned flag from a single page."""
+    text, _, is_scanned, _ = _process_page(page, layout_mode)
+    return text, is_scanned
+
+
+def _process_table_page(page: pymupdf.Page, page_num: int) -> tuple[list[dict], list[str]]:
+    """Extract tables from a single page."""
+    return _extract_page_tables(page)
+
+
+def _init_worker(file_bytes: bytes):
+    """Open the document once in each pool worker."""
+    global _worker_doc
+    _worker_doc = pymupdf.open(stream=file_bytes, filetype="pdf")
+
+
+def _extract_one_page(fn: Callable, page_num: int, args: tuple):
+    """Pool task: run a page processor against the worker's document."""
+    return fn(_worker_doc[page_num], page_num, *args)
+
+
+def _map_pages(
+    fn: Callable,
+    doc: pymupdf.Document,
+    file_bytes: bytes,
+    page_indices: Sequence[int],
+    args: tuple = (),
+    parallel: bool = True,
+) -> list:
+    """
+    Apply a page processor to every page, in page order.
+    
+    With ``parallel`` set and PAGE_WORKERS > 1, large documents are spread
+    over a process pool so table finding runs on several cores. Each worker
+    reopens the PDF once from the bytes passed to its initializer, so the
+    file is not re-pickled for every page. Small documents, and callers
+    whose work is too cheap to pay for the pool's start-up, run in-process.
+    """
+    workers = min(PAGE_WORKERS, len(page_indices))
+    if not parallel or workers < 2 or len(page_indices) < _MIN_PARALLEL_PAGES:
+        return [fn(doc[page_num], page_num, *args) for page_num in page_indices]
+    
+    chunksize = max(1, len(page_indices) // (4 * workers))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(file_bytes,),
+        ) as executor:
+            return list(executor.map(
+                _extract_one_page,
+                repeat(fn),
+                page_indices,
+                repeat(args),
+                chunksize=chunksize,
+            ))
+    except BrokenProcessPool as e:
+        raise PageWorkerCrashed(f"Page worker died: {e}") from e
+
+
 def extract_full(
     file_bytes: bytes,
     filename: str,
@@ -210,61 +400,43 @@ def extract_full(
         total_pages = len(doc)
         page_indices = parse_page_range(page_range, total_pages)
         
+        # Only table finding is heavy enough to be worth the page pool
+        page_dicts = _map_pages(
+            _process_full_page, doc, file_bytes, page_indices,
+            (extract_tables, extract_images, layout_mode),
+            parallel=extract_tables,
+        )
+        
         pages = []
-        all_text_parts = []
-        all_text_with_tables_parts = []
+        full_buf = io.StringIO()
+        tbl_buf = io.StringIO()
         scanned_count = 0
         
-        for page_num in page_indices:
-            page = doc[page_num]
-            
-            # Extract text
-            text = _extract_page_text(page, layout_mode)
-            
-            # Detect scanned
-            is_scanned = _detect_scanned_page(page, text)
-            if is_scanned:
+        for page_dict in page_dicts:
+            if page_dict["is_scanned"]:
                 scanned_count += 1
             
-            # Count text blocks
-            blocks = page.get_text("blocks")
-            text_block_count = len([b for b in blocks if b[6] == 0])  # type 0 = text
+            # Values come straight from the extractors, so skip re-validation
+            pages.append(PageResult.model_construct(**page_dict))
             
-            # Extract tables
-            tables_data = []
-            tables_md = []
-            if extract_tables:
-                tables_data, tables_md = _extract_page_tables(page)
-            
-            # Extract images
-            image_meta = []
-            if extract_images:
-                image_meta = _extract_page_images(page)
-            
-            page_result = PageResult(
-                page_number=page_num,
-                text=text,
-                tables=tables_data,
-                tables_markdown=tables_md,
-                images=image_meta,
-                is_scanned=is_scanned,
-                text_block_count=text_block_count,
-            )
-            pages.append(page_result)
+            text = page_dict["text"]
+            tables_md = page_dict["tables_markdown"]
             
             # Build concatenated text
-            all_text_parts.append(text)
+            full_buf.write(text)
+            full_buf.write("\n")
             
             # Build text with tables inserted
-            page_text_with_tables = text
-            if tables_md:
-                page_text_with_tables += "\n\n" + "\n\n".join(tables_md)
-            all_text_with_tables_parts.append(page_text_with_tables)
+            tbl_buf.write(text)
+            for md in tables_md:
+                tbl_buf.write("\n\n")
+                tbl_buf.write(md)
+            tbl_buf.write("\n")
         
-        full_text = "\n".join(all_text_parts).strip()
-        full_text_with_tables = "\n".join(all_text_with_tables_parts).strip()
+        full_text = full_buf.getvalue().strip()
+        full_text_with_tables = tbl_buf.getvalue().strip()
         
-        return ExtractionResponse(
+        return ExtractionResponse.model_construct(
             success=True,
             filename=filename,
             total_pages=total_pages,
@@ -299,22 +471,27 @@ def extract_text_only(
         total_pages = len(doc)
         page_indices = parse_page_range(page_range, total_pages)
         
-        text_parts = []
+        text_buf = io.StringIO()
         scanned_count = 0
         
-        for page_num in page_indices:
-            page = doc[page_num]
-            text = _extract_page_text(page, layout_mode)
-            text_parts.append(text)
+        page_results = _map_pages(
+            _process_text_page, doc, file_bytes, page_indices,
+            (layout_mode,),
+            parallel=False,
+        )
+        
+        for text, is_scanned in page_results:
+            text_buf.write(text)
+            text_buf.write("\n")
             
-            if _detect_scanned_page(page, text):
+            if is_scanned:
                 scanned_count += 1
         
-        return TextExtractionResponse(
+        return TextExtractionResponse.model_construct(
             success=True,
             filename=filename,
             total_pages=total_pages,
-            text="\n".join(text_parts).strip(),
+            text=text_buf.getvalue().strip(),
             scanned_page_count=scanned_count,
         )
     finally:
@@ -346,17 +523,16 @@ def extract_tables_only(
         all_tables = []
         all_markdown = []
         
-        for page_num in page_indices:
-            page = doc[page_num]
-            tables_data, tables_md = _extract_page_tables(page)
-            
+        page_results = _map_pages(_process_table_page, doc, file_bytes, page_indices)
+        
+        for page_num, (tables_data, tables_md) in zip(page_indices, page_results):
             for table in tables_data:
                 table["page_number"] = page_num
                 all_tables.append(table)
             
             all_markdown.extend(tables_md)
         
-        return TableExtractionResponse(
+        return TableExtractionResponse.model_construct(
             success=True,
             filename=filename,
             total_pages=total_pages,
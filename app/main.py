@@ -7,13 +7,21 @@ over a simple HTTP API.
 SPDX-License-Identifier: AGPL-3.0-or-later
 """
 
+import asyncio
+import functools
+import hashlib
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
+from typing import Optional
 
 import pymupdf
 import uvicorn
 from fastapi import APIRouter, FastAPI, File, Form, UploadFile, HTTPException
+from fastapi.responses import Response
 
 from app.models import (
     ExtractionResponse,
@@ -21,11 +29,20 @@ from app.models import (
     TableExtractionResponse,
     HealthResponse,
 )
-from app.extraction import extract_full, extract_text_only, extract_tables_only
+from app.cache import ResponseCache
+from app.extraction import (
+    PAGE_WORKERS,
+    PageWorkerCrashed,
+    extract_full,
+    extract_text_only,
+    extract_tables_only,
+)
 from app.version import __version__
 from app.banner import display_startup_banner
 
 log_level = os.getenv("LOG_LEVEL", "info").upper()
+port = int(os.getenv("PORT", "12330"))
+workers = int(os.getenv("WORKERS", "1"))
 logging.basicConfig(
     level=getattr(logging, log_level, logging.INFO),
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -33,12 +50,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+_HEALTH_PATH = "/v1/health"
+
+
 class _HealthCheckFilter(logging.Filter):
     """Suppress noisy health-check access-log lines."""
 
     def filter(self, record: logging.LogRecord) -> bool:
-        msg = record.getMessage()
-        return "/v1/health" not in msg
+        # uvicorn passes (client_addr, method, full_path, http_version, status_code),
+        # so the path can be compared without formatting the whole message
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5:
+            return args[2].partition("?")[0] != _HEALTH_PATH
+        return _HEALTH_PATH not in record.getMessage()
 
 
 logging.getLogger("uvicorn.access").addFilter(_HealthCheckFilter())
@@ -46,12 +70,11 @@ logging.getLogger("uvicorn.access").addFilter(_HealthCheckFilter())
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    port = int(os.getenv("PORT", "12330"))
-    workers = int(os.getenv("WORKERS", "1"))
     display_startup_banner(port=port, workers=workers)
     logger.info(f"docparse v{__version__} ready (PyMuPDF {pymupdf.VersionBind})")
     yield
     logger.info("docparse shutting down")
+    _extraction_pool.shutdown(cancel_futures=True)
 
 
 app = FastAPI(
@@ -63,30 +86,125 @@ app = FastAPI(
 
 
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", "50")) * 1024 * 1024  # default 50 MB
+_MAX_MB = MAX_FILE_SIZE // (1024 * 1024)
+_MAX_SIZE_ERROR = f"File too large. Maximum size is {_MAX_MB}MB"
+_READ_CHUNK_SIZE = 1 << 20  # 1 MB
+_WORKER_CRASH_ERROR = "Extraction worker crashed while processing the file"
+
+def _available_cpus() -> int:
+    """Count the CPUs this process may run on, honouring its affinity mask."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Extraction is CPU-bound and PyMuPDF is not thread-safe, so requests run in
+# worker processes rather than on the event loop. "spawn" avoids forking a
+# process that already has event-loop and threadpool threads running.
+# Every uvicorn worker has its own pool and each request may fan out to
+# PAGE_WORKERS page processes, so the pool is sized to keep the total across
+# the server at about one process per available CPU.
+_EXTRACTION_POOL_SIZE = max(1, _available_cpus() // (max(1, workers) * PAGE_WORKERS))
+
+
+def _new_extraction_pool() -> ProcessPoolExecutor:
+    """Create the process pool that extraction requests run in."""
+    return ProcessPoolExecutor(
+        max_workers=_EXTRACTION_POOL_SIZE,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+_extraction_pool = _new_extraction_pool()
+
+CACHE_SIZE = int(os.getenv("CACHE_SIZE_MB", "64")) * 1024 * 1024  # 0 disables the cache
+_response_cache = ResponseCache(max_bytes=CACHE_SIZE)
 
 router = APIRouter(prefix="/v1")
 
 
-async def _read_upload(file: UploadFile) -> tuple[bytes, str]:
-    """Read and validate an uploaded file."""
+async def _read_upload(file: UploadFile) -> tuple[bytearray, str, bytes]:
+    """
+    Read and validate an uploaded file.
+    
+    The upload is already spooled by Starlette, so oversize files are
+    rejected from their recorded size before any bytes are copied, and
+    the content is otherwise read in chunks with the limit enforced as
+    it grows. The SHA-256 used for the response cache is computed chunk
+    by chunk, so hashing never holds the event loop for a whole upload.
+    
+    Returns:
+        Tuple of (content, filename, sha256_digest)
+    """
     filename = file.filename or "unknown.pdf"
     
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    content = await file.read()
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=_MAX_SIZE_ERROR)
+    
+    content = bytearray()
+    digest = hashlib.sha256()
+    while chunk := await file.read(_READ_CHUNK_SIZE):
+        if len(content) + len(chunk) > MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail=_MAX_SIZE_ERROR)
+        content += chunk
+        digest.update(chunk)
     
     if len(content) == 0:
         raise HTTPException(status_code=400, detail="Empty file uploaded")
     
-    if len(content) > MAX_FILE_SIZE:
-        max_mb = MAX_FILE_SIZE // (1024 * 1024)
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {max_mb}MB",
-        )
+    return content, filename, digest.digest()
+
+
+def _cache_key(endpoint: str, digest: bytes, *options) -> tuple:
+    """Build a response-cache key from the upload's SHA-256 and the request options."""
+    return (endpoint, digest, *options)
+
+
+def _cached_response(key: tuple, filename: str) -> Optional[Response]:
+    """Return the cached response for ``key`` if there is one."""
+    body = _response_cache.get(key)
+    if body is None:
+        return None
+    logger.info(f"Serving {filename} from response cache")
+    return Response(content=body, media_type="application/json")
+
+
+def _cache_response(key: tuple, result) -> Response:
+    """Serialize an extraction result and remember the body under ``key``."""
+    # Pydantic's own JSON serializer, without a jsonable_encoder round-trip
+    body = result.model_dump_json().encode()
+    _response_cache.put(key, body)
+    return Response(content=body, media_type="application/json")
+
+
+async def _run_extraction(fn, **kwargs):
+    """
+    Run an extraction function in the process pool without blocking the event loop.
+    
+    If a worker dies (e.g. MuPDF crashing on a hostile PDF, or an OOM kill),
+    the pool is unusable from then on. It is replaced so later requests
+    still work, and only the requests that were running in it fail. A crash
+    in a request's own page pool leaves this pool healthy and untouched.
+    """
+    global _extraction_pool
     
-    return content, filename
+    pool = _extraction_pool
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(fn, **kwargs))
+    except BrokenProcessPool:
+        # Several in-flight requests can fail together; only the first replaces the pool
+        if _extraction_pool is pool:
+            logger.error("Extraction worker died, restarting the process pool")
+            _extraction_pool = _new_extraction_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise HTTPException(status_code=503, detail=_WORKER_CRASH_ERROR)
+    except PageWorkerCrashed as e:
+        logger.error(str(e))
+        raise HTTPException(status_code=503, detail=_WORKER_CRASH_ERROR)
 
 
 @router.post("/extract", response_model=ExtractionResponse)
@@ -104,17 +222,27 @@ async def extract(
     per-page text, detected tables (as markdown), image metadata, and
     scanned page detection.
     """
-    content, filename = await _read_upload(file)
+    content, filename, digest = await _read_upload(file)
+    
+    page_range = page_range if page_range else None
+    
+    cache_key = _cache_key(
+        "extract", digest, filename,
+        extract_tables, extract_images, layout_mode, page_range,
+    )
+    if (cached := _cached_response(cache_key, filename)) is not None:
+        return cached
     
     logger.info(f"Full extraction: {filename} ({len(content)} bytes)")
     
-    result = extract_full(
+    result = await _run_extraction(
+        extract_full,
         file_bytes=content,
         filename=filename,
         extract_tables=extract_tables,
         extract_images=extract_images,
         layout_mode=layout_mode,
-        page_range=page_range if page_range else None,
+        page_range=page_range,
     )
     
     if not result.success:
@@ -126,7 +254,7 @@ async def extract(
         f"{len(result.full_text)} chars"
     )
     
-    return result
+    return _cache_response(cache_key, result)
 
 
 @router.post("/extract/text", response_model=TextExtractionResponse)
@@ -140,21 +268,28 @@ async def extract_text(
     
     Faster than full extraction when you only need the text content.
     """
-    content, filename = await _read_upload(file)
+    content, filename, digest = await _read_upload(file)
+    
+    page_range = page_range if page_range else None
+    
+    cache_key = _cache_key("extract/text", digest, filename, layout_mode, page_range)
+    if (cached := _cached_response(cache_key, filename)) is not None:
+        return cached
     
     logger.info(f"Text extraction: {filename} ({len(content)} bytes)")
     
-    result = extract_text_only(
+    result = await _run_extraction(
+        extract_text_only,
         file_bytes=content,
         filename=filename,
         layout_mode=layout_mode,
-        page_range=page_range if page_range else None,
+        page_range=page_range,
     )
     
     if not result.success:
         raise HTTPException(status_code=422, detail=result.error)
     
-    return result
+    return _cache_response(cache_key, result)
 
 
 @router.post("/extract/tables", response_model=TableExtractionResponse)
@@ -167,20 +302,27 @@ async def extract_tables_endpoint(
     
     Returns detected tables as structured data and markdown format.
     """
-    content, filename = await _read_upload(file)
+    content, filename, digest = await _read_upload(file)
+    
+    page_range = page_range if page_range else None
+    
+    cache_key = _cache_key("extract/tables", digest, filename, page_range)
+    if (cached := _cached_response(cache_key, filename)) is not None:
+        return cached
     
     logger.info(f"Table extraction: {filename} ({len(content)} bytes)")
     
-    result = extract_tables_only(
+    result = await _run_extraction(
+        extract_tables_only,
         file_bytes=content,
         filename=filename,
-        page_range=page_range if page_range else None,
+        page_range=page_range,
     )
     
     if not result.success:
         raise HTTPException(status_code=422, detail=result.error)
     
-    return result
+    return _cache_response(cache_key, result)
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -198,9 +340,6 @@ app.include_router(router)
 
 if __name__ == "__main__":
     # Prefer using run.py at the project root instead.
-    port = int(os.getenv("PORT", "12330"))
-    workers = int(os.getenv("WORKERS", "1"))
-    
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",